@@ -2,15 +2,19 @@ import asyncio
 import aiohttp
 import csv
 import logging
-from typing import List, Dict, Optional
+from typing import IO, List, Dict, Optional
 from pathlib import Path
 from datetime import datetime
-from bs4 import BeautifulSoup
-import json
+from selectolax.lexbor import LexborHTMLParser, LexborNode
+from pybloom_live import ScalableBloomFilter
+import orjson
+import xxhash
+import os
+import random
 import re
 from aiohttp import ClientTimeout, TCPConnector
-from asyncio import Semaphore
-import hashlib
+from aiohttp.compression_utils import HAS_BROTLI
+from asyncio import Queue, Semaphore
 
 # Configure logging
 logging.basicConfig(
@@ -23,19 +27,68 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Patterns used on every listing, compiled once
+_RE_DIGITS = re.compile(r'\d+')
+_RE_WHITESPACE = re.compile(r'\s+')
+
+# Client errors worth retrying; every other 4xx is permanent
+_RETRYABLE_STATUSES = {408, 425, 429}
+
+# Text- and attribute-matched lookups, evaluated inside lexbor's selector engine
+_SEL_ELAN = 'span:lexbor-contains("Elan №")'
+_SEL_CATEGORY = 'span[style*="color"][style*="#ea6f24"]'
+_SEL_ADVERTISER = 'span:lexbor-contains("ƏMLAK"), span:lexbor-contains("Vasitəçi")'
+_SEL_VIEWS = 'td.history:lexbor-contains("Baxış sayı")'
+
+# First <td> of rows that have exactly two cells (key/value property rows)
+_SEL_PROPERTY_KEY = 'tr > td:first-child:nth-last-child(2)'
+
 
 class BirjaScraper:
-    def __init__(self, base_url: str = "https://birja-in.az", max_concurrent: int = 5):
+    # Property table labels mapped to CSV columns
+    PROPERTY_COLUMNS = {
+        'Şəhər/ərazi': 'region',
+        'Elan növü': 'elan_type',
+        'Əmlak növü': 'property_type',
+        'Kirayə müddəti': 'rental_period',
+        'Otaq sayı': 'room_count',
+        'Mərtəbə': 'floor',
+        'Mərtəbəli bina': 'total_floors',
+        'Sahəsi (m²)': 'area_sqm',
+        'Təmiri': 'repair_status',
+        'Ümumi-sahə (sot)': 'land_area_sot',
+        'Evin-sahəsi (m²)': 'house_area_sqm',
+    }
+
+    def __init__(self, base_url: str = "https://birja-in.az", max_concurrent: int = 20):
         self.base_url = base_url
         self.max_concurrent = max_concurrent
         self.semaphore = Semaphore(max_concurrent)
+        self.max_backoff = 8
+        self.max_retry_after = 60
+        self.index_prefetch = 3
         self.session: Optional[aiohttp.ClientSession] = None
-        self.scraped_ids = set()
+        # Bloom filter of scraped IDs: constant memory, rare false positives
+        # only mean a listing is skipped, never scraped twice
+        self.scraped_ids = self.new_id_filter()
         self.failed_urls = []
+        # 64-bit hashes of URLs already in failed_urls, so repeat failures aren't duplicated
+        self._failed_seen = set()
         self.output_file = Path('scraped_data.csv')
-        self.progress_file = Path('scraper_progress.json')
+        self.progress_file = Path('scraped_ids.log')
+        self.legacy_progress_file = Path('scraper_progress.json')
+        self._progress_fh: Optional[IO[str]] = None
         self.failed_file = Path('failed_urls.json')
 
+        # Persistent CSV handle, opened in create_session and fed by a
+        # single writer task that drains rows from a queue in batches
+        self._csv_fh: Optional[IO[str]] = None
+        self._csv_writer: Optional[csv.DictWriter] = None
+        self._header_written = self.output_file.exists() and self.output_file.stat().st_size > 0
+        self._write_queue: Optional[Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self.csv_batch_size = 100
+
         # CSV headers
         self.csv_headers = [
             'elan_id', 'title', 'url', 'price', 'currency', 'location', 'region',
@@ -49,49 +102,98 @@ class BirjaScraper:
         # Load progress
         self.load_progress()
 
+    def new_id_filter(self) -> ScalableBloomFilter:
+        """Create an empty filter for scraped listing IDs"""
+        return ScalableBloomFilter(initial_capacity=100_000, error_rate=1e-7)
+
     def load_progress(self):
         """Load previously scraped IDs to avoid duplicates"""
         try:
+            if self.legacy_progress_file.exists():
+                # Seed the filter from the old JSON list of IDs
+                with open(self.legacy_progress_file, 'rb') as f:
+                    progress = orjson.loads(f.read())
+                for elan_id in progress.get('scraped_ids', []):
+                    self.scraped_ids.add(elan_id)
+
             if self.progress_file.exists():
+                # Replay the append-only ID log
                 with open(self.progress_file, 'r', encoding='utf-8') as f:
-                    progress = json.load(f)
-                    self.scraped_ids = set(progress.get('scraped_ids', []))
+                    for line in f:
+                        elan_id = line.strip()
+                        if elan_id:
+                            self.scraped_ids.add(elan_id)
+
+            if len(self.scraped_ids):
                 logger.info(f"Loaded {len(self.scraped_ids)} previously scraped IDs")
         except Exception as e:
             logger.error(f"Error loading progress: {e}")
 
+    def mark_scraped(self, elan_ids: List[str]):
+        """Record IDs whose rows reached the CSV in memory and in the ID log"""
+        for elan_id in elan_ids:
+            self.scraped_ids.add(elan_id)
+        try:
+            if self._progress_fh is None:
+                self._progress_fh = open(self.progress_file, 'a', encoding='utf-8', buffering=1)
+            self._progress_fh.writelines(f"{elan_id}\n" for elan_id in elan_ids)
+        except Exception as e:
+            logger.error(f"Error saving progress: {e}")
+
     def save_progress(self):
-        """Save progress to resume if interrupted"""
+        """Flush and close the scraped ID log"""
+        if self._progress_fh is None:
+            return
+
         try:
-            with open(self.progress_file, 'w', encoding='utf-8') as f:
-                json.dump({
-                    'scraped_ids': list(self.scraped_ids),
-                    'last_update': datetime.now().isoformat()
-                }, f, ensure_ascii=False, indent=2)
+            self._progress_fh.close()
         except Exception as e:
             logger.error(f"Error saving progress: {e}")
+        finally:
+            self._progress_fh = None
 
     def save_failed_urls(self):
         """Save failed URLs for retry"""
         try:
-            with open(self.failed_file, 'w', encoding='utf-8') as f:
-                json.dump({
+            # Write to a temp file and swap it in so a crash never leaves a truncated file
+            tmp_file = self.failed_file.with_name(self.failed_file.name + '.tmp')
+            with open(tmp_file, 'wb') as f:
+                f.write(orjson.dumps({
                     'failed_urls': self.failed_urls,
                     'count': len(self.failed_urls)
-                }, f, ensure_ascii=False, indent=2)
+                }, option=orjson.OPT_INDENT_2))
+            os.replace(tmp_file, self.failed_file)
         except Exception as e:
             logger.error(f"Error saving failed URLs: {e}")
 
     async def create_session(self):
         """Create aiohttp session with proper configuration"""
         timeout = ClientTimeout(total=60, connect=10, sock_read=30)
-        connector = TCPConnector(limit=20, limit_per_host=5, ttl_dns_cache=300)
+        # asyncio enables TCP_NODELAY on every TCP transport it creates, so small
+        # GETs go out without Nagle delays; keep pooled connections alive and
+        # reap half-closed TLS sockets the server abandons
+        connector = TCPConnector(
+            limit=max(20, self.max_concurrent),
+            limit_per_host=self.max_concurrent,
+            ttl_dns_cache=300,
+            use_dns_cache=True,
+            force_close=False,
+            enable_cleanup_closed=True
+        )
+
+        # Brotli shrinks HTML noticeably over gzip, but only ask for it when
+        # aiohttp found a brotli module to decode it with
+        if HAS_BROTLI:
+            accept_encoding = 'gzip, deflate, br'
+        else:
+            logger.warning("brotli is not installed; falling back to gzip/deflate")
+            accept_encoding = 'gzip, deflate'
 
         headers = {
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'az,en-US;q=0.7,en;q=0.3',
-            'Accept-Encoding': 'gzip, deflate, br',
+            'Accept-Encoding': accept_encoding,
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1'
         }
@@ -102,49 +204,170 @@ class BirjaScraper:
             headers=headers
         )
 
+        self.open_csv()
+        self._write_queue = Queue(maxsize=1000)
+        self._writer_task = asyncio.create_task(self._csv_writer_loop())
+
     async def close_session(self):
         """Close aiohttp session"""
         if self.session:
             await self.session.close()
+        await self.stop_csv_writer()
+        self.close_csv()
+
+    def open_csv(self):
+        """Open the output CSV once and keep the writer for the whole run"""
+        if self._csv_fh is not None:
+            return
+
+        self._csv_fh = open(self.output_file, 'a', newline='', encoding='utf-8', buffering=1 << 16)
+        self._csv_writer = csv.DictWriter(self._csv_fh, fieldnames=self.csv_headers, extrasaction='ignore')
+
+        if not self._header_written:
+            self._csv_writer.writeheader()
+            self._header_written = True
+
+    def close_csv(self):
+        """Flush and close the output CSV"""
+        if self._csv_fh is None:
+            return
+
+        try:
+            self._csv_fh.close()
+        except Exception as e:
+            logger.error(f"Error closing CSV: {e}")
+        finally:
+            self._csv_fh = None
+            self._csv_writer = None
+
+    async def stop_csv_writer(self):
+        """Drain queued rows and stop the writer task"""
+        if self._writer_task is None:
+            return
+
+        # A writer that already died would never take the sentinel off a full queue
+        if not self._writer_task.done():
+            await self._write_queue.put(None)
+        try:
+            await self._writer_task
+        except Exception as e:
+            logger.error(f"Error in CSV writer: {e}")
+        finally:
+            self._writer_task = None
+            self._write_queue = None
+
+    async def _csv_writer_loop(self):
+        """Write queued rows in batches off the event loop until a None sentinel arrives"""
+        queue = self._write_queue
+        while True:
+            row = await queue.get()
+            if row is None:
+                return
+
+            # Take whatever else piled up while the previous batch was written
+            batch = [row]
+            stop = False
+            while len(batch) < self.csv_batch_size and not queue.empty():
+                row = queue.get_nowait()
+                if row is None:
+                    stop = True
+                    break
+                batch.append(row)
+
+            # Only log IDs once their rows are flushed, so a crash never
+            # records a listing whose row was still sitting in the queue.
+            # Errors are logged, never raised: producers block on a full
+            # queue if this consumer dies
+            try:
+                if await asyncio.to_thread(self.write_rows, batch):
+                    self.mark_scraped([row['elan_id'] for row in batch])
+            except Exception as e:
+                logger.error(f"Error in CSV writer: {e}")
+            if stop:
+                return
 
-    async def fetch_with_retry(self, url: str, max_retries: int = 5) -> Optional[str]:
-        """Fetch URL with exponential backoff retry"""
+    def write_rows(self, rows: List[Dict]) -> bool:
+        """Append a batch of rows to the CSV file; returns True once they are flushed"""
+        try:
+            self.open_csv()
+            self._csv_writer.writerows(rows)
+            self._csv_fh.flush()
+
+            logger.info(f"Saved {len(rows)} listings to CSV")
+            return True
+        except Exception as e:
+            logger.error(f"Error writing to CSV: {e}")
+            # Save to backup file
+            backup_file = Path(f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+            try:
+                with open(backup_file, 'ab') as f:
+                    for data in rows:
+                        f.write(orjson.dumps(data, option=orjson.OPT_APPEND_NEWLINE))
+            except Exception as e:
+                logger.error(f"Error writing backup {backup_file}: {e}")
+            return False
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Capped exponential backoff with jitter so retries don't wake in lockstep"""
+        return min(self.max_backoff, 2 ** attempt) * (0.5 + random.random())
+
+    async def fetch_with_retry(self, url: str, max_retries: int = 5) -> Optional[bytes]:
+        """Fetch URL body as raw bytes with jittered exponential backoff retry"""
+        semaphore = self.semaphore
+        session = self.session
         for attempt in range(max_retries):
+            wait_time = self.backoff_delay(attempt)
             try:
-                async with self.semaphore:
-                    async with self.session.get(url) as response:
-                        if response.status == 200:
-                            return await response.text()
-                        elif response.status == 404:
+                async with semaphore:
+                    async with session.get(url) as response:
+                        status = response.status
+                        if status == 200:
+                            # Hand raw bytes to the parser; it decodes UTF-8 itself,
+                            # which skips aiohttp's per-response charset detection
+                            return await response.read()
+                        elif status == 404:
                             logger.warning(f"404 Not Found: {url}")
                             return None
+                        elif status in _RETRYABLE_STATUSES or status >= 500:
+                            retry_after = response.headers.get('Retry-After', '')
+                            if retry_after.isdigit():
+                                wait_time = min(int(retry_after), self.max_retry_after)
+                            logger.warning(f"Status {status} for {url}, retry {attempt + 1}/{max_retries} after {wait_time:.1f}s")
                         else:
-                            logger.warning(f"Status {response.status} for {url}")
+                            logger.warning(f"Status {status} for {url}, not retrying")
+                            break
             except asyncio.TimeoutError:
-                wait_time = 2 ** attempt
-                logger.warning(f"Timeout on {url}, retry {attempt + 1}/{max_retries} after {wait_time}s")
-                await asyncio.sleep(wait_time)
+                logger.warning(f"Timeout on {url}, retry {attempt + 1}/{max_retries} after {wait_time:.1f}s")
             except aiohttp.ClientError as e:
-                wait_time = 2 ** attempt
-                logger.warning(f"Client error on {url}: {e}, retry {attempt + 1}/{max_retries} after {wait_time}s")
-                await asyncio.sleep(wait_time)
+                logger.warning(f"Client error on {url}: {e}, retry {attempt + 1}/{max_retries} after {wait_time:.1f}s")
             except Exception as e:
                 logger.error(f"Unexpected error fetching {url}: {e}")
-                await asyncio.sleep(2 ** attempt)
+
+            # No point sleeping after the last attempt
+            if attempt + 1 < max_retries:
+                await asyncio.sleep(wait_time)
 
         # All retries failed
-        self.failed_urls.append({'url': url, 'time': datetime.now().isoformat()})
+        self.record_failed(url)
         return None
 
-    def extract_listing_info(self, listing_html: BeautifulSoup) -> Optional[Dict]:
+    def record_failed(self, url: str):
+        """Remember a failed URL once, however many times it fails"""
+        url_hash = xxhash.xxh3_64_intdigest(url.encode())
+        if url_hash in self._failed_seen:
+            return
+        self._failed_seen.add(url_hash)
+        self.failed_urls.append({'url': url, 'time': datetime.now().isoformat()})
+
+    def extract_listing_info(self, listing_html: LexborNode) -> Optional[Dict]:
         """Extract basic info from listing card"""
         try:
             data = {}
 
             # Extract elan ID
-            elan_num = listing_html.find('span', string=re.compile(r'Elan №'))
+            elan_num = listing_html.css_first(_SEL_ELAN)
             if elan_num:
-                data['elan_id'] = re.search(r'\d+', elan_num.text).group()
+                data['elan_id'] = _RE_DIGITS.search(elan_num.text()).group()
             else:
                 return None
 
@@ -154,121 +377,118 @@ class BirjaScraper:
                 return None
 
             # Extract title and URL
-            title_elem = listing_html.find('h2')
+            title_elem = listing_html.css_first('h2')
             if title_elem:
-                link = title_elem.find('a')
+                link = title_elem.css_first('a')
                 if link:
-                    data['title'] = link.find('span', itemprop='name').text.strip() if link.find('span', itemprop='name') else link.text.strip()
+                    name_elem = link.css_first('span[itemprop="name"]')
+                    data['title'] = (name_elem or link).text().strip()
                     # Clean URL by removing extra whitespace
-                    href = link.get('href', '')
+                    href = link.attributes.get('href') or ''
                     # Replace multiple spaces with single space, then replace space with hyphen if needed
-                    href = re.sub(r'\s+', '-', href.strip())
+                    href = _RE_WHITESPACE.sub('-', href.strip())
                     data['url'] = self.base_url + href
 
             # Extract price
-            price_elem = listing_html.find('span', class_='value_cost_adv')
+            price_elem = listing_html.css_first('span.value_cost_adv')
             if price_elem:
-                data['price'] = price_elem.text.strip().replace(' ', '')
+                data['price'] = price_elem.text().strip().replace(' ', '')
 
-            currency_elem = listing_html.find('span', class_='value_currency')
+            currency_elem = listing_html.css_first('span.value_currency')
             if currency_elem:
-                data['currency'] = currency_elem.text.strip()
+                data['currency'] = currency_elem.text().strip()
 
             # Extract location
-            location_elem = listing_html.find('div', class_='block_name_region_adv')
+            location_elem = listing_html.css_first('div.block_name_region_adv')
             if location_elem:
-                data['location'] = location_elem.text.strip()
+                data['location'] = location_elem.text().strip()
 
             # Extract category
-            category_elem = listing_html.find('div', class_='block_name_category_adv')
+            category_elem = listing_html.css_first('div.block_name_category_adv')
             if category_elem:
-                category_span = category_elem.find('span', style=re.compile(r'color.*#ea6f24'))
+                category_span = category_elem.css_first(_SEL_CATEGORY)
                 if category_span:
-                    data['category'] = category_span.text.strip()
+                    data['category'] = category_span.text().strip()
 
             # Extract short description
-            desc_elem = listing_html.find('div', class_='short-text-ads')
+            desc_elem = listing_html.css_first('div.short-text-ads')
             if desc_elem:
-                data['short_description'] = desc_elem.text.strip()
+                data['short_description'] = desc_elem.text().strip()
 
             # Extract date
-            date_elem = listing_html.find('span', itemprop='datePosted')
+            date_elem = listing_html.css_first('span[itemprop="datePosted"]')
             if date_elem:
-                data['date_posted'] = date_elem.text.strip()
+                data['date_posted'] = date_elem.text().strip()
 
             return data
         except Exception as e:
             logger.error(f"Error extracting listing info: {e}")
             return None
 
-    def extract_detail_info(self, html: str, basic_info: Dict) -> Dict:
-        """Extract detailed information from detail page"""
+    def extract_detail_info(self, html: bytes, basic_info: Dict) -> Dict:
+        """Extract detailed information from detail page into basic_info (updated in place)"""
+        data = basic_info
         try:
-            soup = BeautifulSoup(html, 'html.parser')
-            data = basic_info.copy()
+            tree = LexborHTMLParser(html)
 
             # Extract full description
-            desc_elem = soup.find('td', itemprop='description')
+            desc_elem = tree.css_first('td[itemprop="description"]')
             if desc_elem:
-                data['description'] = desc_elem.text.strip()
+                data['description'] = desc_elem.text().strip()
 
-            # Extract all properties from the table
+            # Extract all properties from the table: select the first cell
+            # of every two-cell row in one query and step to its sibling
             properties = {}
-            property_rows = soup.find_all('tr')
-            for row in property_rows:
-                cells = row.find_all('td')
-                if len(cells) == 2:
-                    key = cells[0].text.strip()
-                    value = cells[1].text.strip()
-                    if key and value:
-                        properties[key] = value
-
-            # Map specific properties
-            data['region'] = properties.get('Şəhər/ərazi', '')
-            data['elan_type'] = properties.get('Elan növü', '')
-            data['property_type'] = properties.get('Əmlak növü', '')
-            data['rental_period'] = properties.get('Kirayə müddəti', '')
-            data['room_count'] = properties.get('Otaq sayı', '')
-            data['floor'] = properties.get('Mərtəbə', '')
-            data['total_floors'] = properties.get('Mərtəbəli bina', '')
-            data['area_sqm'] = properties.get('Sahəsi (m²)', '')
-            data['repair_status'] = properties.get('Təmiri', '')
-            data['land_area_sot'] = properties.get('Ümumi-sahə (sot)', '')
-            data['house_area_sqm'] = properties.get('Evin-sahəsi (m²)', '')
+            for key_cell in tree.css(_SEL_PROPERTY_KEY):
+                value_cell = key_cell.next
+                while value_cell is not None and value_cell.tag != 'td':
+                    value_cell = value_cell.next
+                if value_cell is None:
+                    continue
+                key = key_cell.text().strip()
+                value = value_cell.text().strip()
+                if key and value:
+                    properties[key] = value
+
+            # Map specific properties; unmapped columns are written empty by the CSV writer
+            for key, value in properties.items():
+                column = self.PROPERTY_COLUMNS.get(key)
+                if column:
+                    data[column] = value
 
             # Extract advertiser type
-            advertiser_elem = soup.find('span', string=re.compile(r'ƏMLAK|Vasitəçi'))
+            advertiser_elem = tree.css_first(_SEL_ADVERTISER)
             if advertiser_elem:
-                data['advertiser_type'] = advertiser_elem.text.strip()
+                data['advertiser_type'] = advertiser_elem.text().strip()
 
             # Extract contact info
-            contact_name = soup.find('td', class_='name_adder')
+            contact_name = tree.css_first('td.name_adder')
             if contact_name:
-                data['contact_name'] = contact_name.text.strip().split('\n')[0].strip()
+                data['contact_name'] = contact_name.text().strip().split('\n')[0].strip()
 
             # Extract phone
-            phone_row = soup.find('td', class_='td_name_param_phone')
-            if phone_row and phone_row.find_next('td'):
-                data['phone'] = phone_row.find_next('td').text.strip()
+            phone_cell = tree.css_first('td.td_name_param_phone + td')
+            if phone_cell:
+                data['phone'] = phone_cell.text().strip()
 
             # Extract view count
-            view_elem = soup.find('td', class_='history', string=re.compile(r'Baxış sayı'))
+            view_elem = tree.css_first(_SEL_VIEWS)
             if view_elem:
-                match = re.search(r'\d+', view_elem.text)
+                match = _RE_DIGITS.search(view_elem.text())
                 if match:
                     data['view_count'] = match.group()
 
             # Extract images
             images = []
-            img_links = soup.find_all('a', class_='fancybox-buttons')
+            img_links = tree.css('a.fancybox-buttons')
             for img_link in img_links:
-                img_url = img_link.get('href')
+                img_url = img_link.attributes.get('href')
                 if img_url:
                     images.append(self.base_url + img_url if not img_url.startswith('http') else img_url)
             data['images'] = '|'.join(images)
 
             # Store all properties as JSON
-            data['all_properties'] = json.dumps(properties, ensure_ascii=False)
+            data['all_properties'] = orjson.dumps(properties).decode()
 
             # Add scrape timestamp
             data['scraped_at'] = datetime.now().isoformat()
@@ -276,31 +496,18 @@ class BirjaScraper:
             return data
         except Exception as e:
             logger.error(f"Error extracting detail info: {e}")
-            return basic_info
-
-    def write_to_csv(self, data: Dict):
-        """Append data to CSV file (thread-safe)"""
-        try:
-            file_exists = self.output_file.exists()
-
-            with open(self.output_file, 'a', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=self.csv_headers, extrasaction='ignore')
-
-                if not file_exists:
-                    writer.writeheader()
+            return data
 
-                writer.writerow(data)
+    async def write_to_csv(self, data: Dict):
+        """Queue a row for the CSV writer task"""
+        if self._write_queue is None:
+            if self.write_rows([data]):
+                self.mark_scraped([data['elan_id']])
+            return
 
-            logger.info(f"Saved listing {data.get('elan_id')} to CSV")
-        except Exception as e:
-            logger.error(f"Error writing to CSV: {e}")
-            # Save to backup file
-            backup_file = Path(f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
-            with open(backup_file, 'a', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False)
-                f.write('\n')
+        await self._write_queue.put(data)
 
-    async def scrape_listing(self, listing_html: BeautifulSoup):
+    async def scrape_listing(self, listing_html: LexborNode):
         """Scrape a single listing"""
         try:
             # Extract basic info
@@ -317,37 +524,54 @@ class BirjaScraper:
                 logger.warning(f"Failed to fetch detail page for {elan_id}")
                 return
 
-            # Extract detailed info
-            full_data = self.extract_detail_info(detail_html, basic_info)
+            # Extract detailed info off the event loop
+            full_data = await asyncio.to_thread(self.extract_detail_info, detail_html, basic_info)
 
-            # Save to CSV
-            self.write_to_csv(full_data)
-
-            # Mark as scraped
+            # Save to CSV; the ID is logged as scraped once the row is flushed,
+            # but is skipped for the rest of this run straight away
             self.scraped_ids.add(elan_id)
-
-            # Save progress periodically
-            if len(self.scraped_ids) % 10 == 0:
-                self.save_progress()
+            await self.write_to_csv(full_data)
 
         except Exception as e:
             logger.error(f"Error scraping listing: {e}")
 
+    def page_url(self, page_num: int) -> str:
+        """URL of a listing index page"""
+        return f"{self.base_url}/elanlar/ev-alqi-satqisi/num{page_num}.html"
+
+    async def fetch_page(self, page_num: int) -> Optional[bytes]:
+        """Fetch a listing index page"""
+        url = self.page_url(page_num)
+        logger.info(f"Scraping page {page_num}: {url}")
+        return await self.fetch_with_retry(url)
+
     async def scrape_page(self, page_num: int):
         """Scrape a single page of listings"""
-        try:
-            url = f"{self.base_url}/elanlar/ev-alqi-satqisi/num{page_num}.html"
-            logger.info(f"Scraping page {page_num}: {url}")
+        html = await self.fetch_page(page_num)
+        await self.process_page(page_num, html)
 
-            html = await self.fetch_with_retry(url)
+    async def process_page(self, page_num: int, html: Optional[bytes]):
+        """Scrape every listing on an already fetched index page"""
+        try:
             if not html:
                 logger.warning(f"Failed to fetch page {page_num}")
                 return
 
-            soup = BeautifulSoup(html, 'html.parser')
+            tree = await asyncio.to_thread(LexborHTMLParser, html)
+
+            # Collect every listing ID on the page in one query and bail out
+            # early when a re-run has already scraped all of them
+            page_ids = {
+                match.group()
+                for span in tree.css(_SEL_ELAN)
+                if (match := _RE_DIGITS.search(span.text()))
+            }
+            if page_ids and all(elan_id in self.scraped_ids for elan_id in page_ids):
+                logger.info(f"All {len(page_ids)} listings on page {page_num} already scraped")
+                return
 
             # Find all listing blocks
-            listings = soup.find_all('div', class_='block_one_synopsis_advert')
+            listings = tree.css('div.block_one_synopsis_advert')
             logger.info(f"Found {len(listings)} listings on page {page_num}")
 
             # Scrape each listing
@@ -359,22 +583,39 @@ class BirjaScraper:
 
     async def scrape_pages(self, start_page: int = 52, end_page: int = 52):
         """Scrape multiple pages"""
+        fetches: Dict[int, asyncio.Task] = {}
+        page_tasks: List[asyncio.Task] = []
         try:
             await self.create_session()
 
-            # Scrape pages sequentially to avoid overwhelming the server
-            for page_num in range(start_page, end_page + 1):
-                await self.scrape_page(page_num)
-                # Small delay between pages
-                await asyncio.sleep(1)
+            # Keep a small window of index fetches in flight so the next page's
+            # round trip overlaps parsing and detail fetches of the current one;
+            # all requests share the connection pool and the semaphore
+            pages = list(range(start_page, end_page + 1))
+            for i, page_num in enumerate(pages):
+                for ahead in pages[i:i + self.index_prefetch]:
+                    if ahead not in fetches:
+                        fetches[ahead] = asyncio.create_task(self.fetch_page(ahead))
+
+                html = await fetches.pop(page_num)
+                page_tasks.append(asyncio.create_task(self.process_page(page_num, html)))
+
+            await asyncio.gather(*page_tasks, return_exceptions=True)
 
         except Exception as e:
             logger.error(f"Error in scrape_pages: {e}")
         finally:
-            # Save final progress
+            # Cancel anything still in flight and wait for it to unwind before
+            # the session and CSV queue it may still be using are closed
+            pending = [*fetches.values(), *page_tasks]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+            # Drain the CSV writer first: it logs the last IDs as it flushes
+            await self.close_session()
             self.save_progress()
             self.save_failed_urls()
-            await self.close_session()
 
             logger.info(f"Scraping completed. Total scraped: {len(self.scraped_ids)}")
             logger.info(f"Failed URLs: {len(self.failed_urls)}")
@@ -386,8 +627,8 @@ class BirjaScraper:
             return
 
         try:
-            with open(self.failed_file, 'r', encoding='utf-8') as f:
-                failed_data = json.load(f)
+            with open(self.failed_file, 'rb') as f:
+                failed_data = orjson.loads(f.read())
                 failed_urls = failed_data.get('failed_urls', [])
 
             if not failed_urls:
@@ -400,6 +641,7 @@ class BirjaScraper:
 
             # Clear failed list for new attempt
             self.failed_urls = []
+            self._failed_seen.clear()
 
             # Retry each URL
             for failed_item in failed_urls:
@@ -417,7 +659,7 @@ class BirjaScraper:
 
 async def main():
     """Main entry point"""
-    scraper = BirjaScraper(max_concurrent=5)
+    scraper = BirjaScraper(max_concurrent=20)
 
     try:
         # Scrape page 52 (can adjust range as needed)
@@ -1,7 +1,16 @@
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import matplotlib
+matplotlib.use('Agg')
+matplotlib.rcParams['toolbar'] = 'None'
 import matplotlib.pyplot as plt
 import seaborn as sns
+import hashlib
 import json
+import multiprocessing
+import os
 import re
 from pathlib import Path
 import warnings
@@ -14,379 +23,537 @@ plt.rcParams['font.size'] = 10
 plt.rcParams['axes.titlesize'] = 14
 plt.rcParams['axes.labelsize'] = 11
 
-# Create charts directory
-Path('charts').mkdir(exist_ok=True)
-
-# Read data
-df = pd.read_csv('scraped_data.csv')
-
-print(f"Total listings: {len(df)}")
-print(f"Columns: {df.columns.tolist()}")
-
-# Clean and prepare data
-def clean_price(price_str):
-    """Extract numeric price from string"""
-    if pd.isna(price_str):
-        return None
-    price_str = str(price_str).replace(' ', '').replace(',', '')
-    match = re.search(r'\d+', price_str)
-    return int(match.group()) if match else None
-
-def extract_region(region_str):
-    """Extract main region from full location string"""
-    if pd.isna(region_str):
-        return 'Unknown'
-    region_str = str(region_str)
-    # Extract first part before comma or special char
-    if '‚' in region_str:
-        return region_str.split('‚')[0].strip()
-    elif ',' in region_str:
-        return region_str.split(',')[0].strip()
-    return region_str.strip()
-
-def extract_rooms(room_str):
-    """Extract number of rooms"""
-    if pd.isna(room_str):
-        return None
-    room_str = str(room_str)
-    if 'Studio' in room_str or 'studio' in room_str:
-        return 0
-    match = re.search(r'(\d+)', room_str)
-    if match:
-        num = int(match.group(1))
-        return num if num < 20 else None  # Filter outliers
-    return None
-
-def clean_area(area_str):
-    """Extract numeric area"""
-    if pd.isna(area_str):
-        return None
-    area_str = str(area_str).replace(',', '.')
-    match = re.search(r'(\d+\.?\d*)', area_str)
-    if match:
-        area = float(match.group(1))
-        return area if 10 < area < 1000 else None  # Filter outliers
-    return None
-
-# Clean data
-df['price_clean'] = df['price'].apply(clean_price)
-df['region_clean'] = df['region'].apply(extract_region)
-df['rooms_clean'] = df['room_count'].apply(extract_rooms)
-df['area_clean'] = df['area_sqm'].apply(clean_area)
-
-# Extract property type from category
-def get_property_type(category):
-    if pd.isna(category):
-        return 'Other'
-    category = str(category).lower()
-    if 'yeni tikili' in category:
-        return 'New Building'
-    elif 'həyət' in category or 'villa' in category or 'bağ' in category:
-        return 'House/Villa'
-    elif 'kirayə' in category:
-        return 'Rental'
-    elif 'obyekt' in category or 'ofis' in category:
-        return 'Commercial'
-    else:
-        return 'Apartment'
-
-df['property_type'] = df['category'].apply(get_property_type)
-
-# Filter only listings with prices in AZN
-df_azn = df[(df['currency'] == 'azn') & (df['price_clean'].notna()) & (df['price_clean'] > 0)]
-
-print(f"\nListings with valid AZN prices: {len(df_azn)}")
-print(f"Price range: {df_azn['price_clean'].min():,.0f} - {df_azn['price_clean'].max():,.0f} AZN")
-
-# === CHART 1: Price Distribution by Property Type ===
-plt.figure(figsize=(12, 6))
-property_prices = df_azn.groupby('property_type')['price_clean'].agg(['mean', 'median', 'count'])
-property_prices = property_prices[property_prices['count'] >= 10].sort_values('median', ascending=False)
-
-x = range(len(property_prices))
-width = 0.35
-
-fig, ax = plt.subplots(figsize=(12, 6))
-bars1 = ax.bar([i - width/2 for i in x], property_prices['median']/1000, width, label='Median Price', color='#2E86AB')
-bars2 = ax.bar([i + width/2 for i in x], property_prices['mean']/1000, width, label='Average Price', color='#A23B72')
-
-ax.set_ylabel('Price (thousand AZN)', fontweight='bold')
-ax.set_title('Property Prices by Type - Market Overview', fontweight='bold', fontsize=14)
-ax.set_xticks(x)
-ax.set_xticklabels(property_prices.index, rotation=45, ha='right')
-ax.legend()
-ax.grid(axis='y', alpha=0.3)
-
-# Add value labels
-for bars in [bars1, bars2]:
-    for bar in bars:
-        height = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width()/2., height,
-                f'{height:.0f}K',
-                ha='center', va='bottom', fontsize=9)
-
-plt.tight_layout()
-plt.savefig('charts/01_price_by_property_type.png', dpi=300, bbox_inches='tight')
-plt.close()
-print("✓ Generated: Price by Property Type")
-
-# === CHART 2: Market Supply by Region (Top 15) ===
-plt.figure(figsize=(14, 6))
-region_counts = df['region_clean'].value_counts().head(15)
-
-fig, ax = plt.subplots(figsize=(14, 6))
-bars = ax.barh(range(len(region_counts)), region_counts.values, color='#06A77D')
-ax.set_yticks(range(len(region_counts)))
-ax.set_yticklabels(region_counts.index)
-ax.set_xlabel('Number of Listings', fontweight='bold')
-ax.set_title('Market Supply by Region - Where Properties Are Listed', fontweight='bold', fontsize=14)
-ax.grid(axis='x', alpha=0.3)
-ax.invert_yaxis()
-
-# Add value labels
-for i, v in enumerate(region_counts.values):
-    ax.text(v + 5, i, str(v), va='center', fontweight='bold')
-
-plt.tight_layout()
-plt.savefig('charts/02_supply_by_region.png', dpi=300, bbox_inches='tight')
-plt.close()
-print("✓ Generated: Supply by Region")
-
-# === CHART 3: Price Distribution by Number of Rooms ===
-df_rooms = df_azn[df_azn['rooms_clean'].notna() & (df_azn['rooms_clean'] <= 6)]
-if len(df_rooms) > 50:
-    plt.figure(figsize=(12, 6))
-    room_prices = df_rooms.groupby('rooms_clean')['price_clean'].agg(['median', 'count'])
-    room_prices = room_prices[room_prices['count'] >= 10]
+# Shared savefig options; zlib level 1 keeps PNG encoding cheap
+SAVEFIG_KWARGS = {'dpi': 150, 'bbox_inches': 'tight', 'pil_kwargs': {'compress_level': 1}}
 
-    fig, ax1 = plt.subplots(figsize=(12, 6))
+CSV_PATH = 'scraped_data.csv'
 
-    color = '#2E86AB'
-    ax1.set_xlabel('Number of Rooms', fontweight='bold')
-    ax1.set_ylabel('Median Price (AZN)', color=color, fontweight='bold')
-    bars = ax1.bar(room_prices.index, room_prices['median'], color=color, alpha=0.7, label='Median Price')
-    ax1.tick_params(axis='y', labelcolor=color)
-    ax1.grid(axis='y', alpha=0.3)
+# Part of the Parquet cache key; bump whenever clean_listings() adds or changes a column
+CACHE_VERSION = 3
 
-    # Add second y-axis for count
-    ax2 = ax1.twinx()
-    color = '#F18F01'
-    ax2.set_ylabel('Number of Listings', color=color, fontweight='bold')
-    line = ax2.plot(room_prices.index, room_prices['count'], color=color, marker='o', linewidth=2, markersize=8, label='Listing Count')
-    ax2.tick_params(axis='y', labelcolor=color)
+# Columns of scraped_data.csv the analysis uses
+USECOLS = [
+    'elan_id', 'price', 'currency', 'region', 'room_count', 'area_sqm',
+    'category', 'view_count', 'date_posted', 'advertiser_type'
+]
 
-    # Add value labels on bars
-    for i, v in enumerate(room_prices['median']):
-        ax1.text(room_prices.index[i], v + 5000, f'{v/1000:.0f}K', ha='center', va='bottom', fontweight='bold')
+# Number patterns run by Arrow's RE2 kernels (extract_regex needs a named group)
+_PRICE_STRIP_PATTERN = r'[ ,]'
+_PRICE_PATTERN = r'(?P<price>\d+)'
+_ROOMS_PATTERN = r'(?P<rooms>\d+)'
+_AREA_PATTERN = r'(?P<area>\d+(?:\.\d+)?)'
 
-    plt.title('Property Prices by Number of Rooms', fontweight='bold', fontsize=14)
-    fig.tight_layout()
-    plt.savefig('charts/03_price_by_rooms.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    print("✓ Generated: Price by Rooms")
-
-# === CHART 4: Listing Engagement Analysis - View Count Insights ===
-df_views = df_azn[df_azn['view_count'].notna()].copy()
-if len(df_views) > 100:
-    # Convert view_count to numeric
-    df_views['views_numeric'] = pd.to_numeric(df_views['view_count'], errors='coerce')
-    df_views = df_views[df_views['views_numeric'].notna() & (df_views['views_numeric'] > 0)]
-
-    # Create view categories
-    view_bins = [0, 100, 500, 1000, 2000, 10000]
-    view_labels = ['Low (<100)', 'Medium (100-500)', 'High (500-1K)', 'Very High (1K-2K)', 'Viral (>2K)']
-    df_views['view_category'] = pd.cut(df_views['views_numeric'], bins=view_bins, labels=view_labels)
-
-    # Analyze price vs engagement
-    view_analysis = df_views.groupby('view_category').agg({
-        'price_clean': 'median',
-        'elan_id': 'count'
-    }).dropna()
+# Patterns used by the pandas cleaners, compiled once
+_REGION_SEP_RE = re.compile(r'[‚,]')
+_HOUSE_RE = re.compile(r'həyət|villa|bağ')
+_COMMERCIAL_RE = re.compile(r'obyekt|ofis')
 
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+# Azerbaijani month names used in date_posted ("15 noyabr 2025")
+MONTHS_AZ = {
+    'yanvar': '01', 'fevral': '02', 'mart': '03', 'aprel': '04',
+    'may': '05', 'iyun': '06', 'iyul': '07', 'avqust': '08',
+    'sentyabr': '09', 'oktyabr': '10', 'noyabr': '11', 'dekabr': '12',
+}
 
-    # Left: Listing count by engagement
-    colors1 = ['#E63946', '#F18F01', '#06A77D', '#2E86AB', '#7209B7']
-    bars1 = ax1.bar(range(len(view_analysis)), view_analysis['elan_id'], color=colors1[:len(view_analysis)])
-    ax1.set_xticks(range(len(view_analysis)))
-    ax1.set_xticklabels(view_analysis.index, rotation=45, ha='right')
-    ax1.set_ylabel('Number of Listings', fontweight='bold')
-    ax1.set_title('Listing Distribution by Engagement Level', fontweight='bold')
-    ax1.grid(axis='y', alpha=0.3)
+# Clean and prepare data (each cleaner works on a whole column at once)
+def _arrow_strings(values):
+    """Arrow string data behind a Series, for pyarrow.compute kernels"""
+    return pa.array(values.astype(pd.ArrowDtype(pa.string())).array)
+
+def _extract_number(strings, pattern, index):
+    """First match of pattern in each Arrow string as a float64 Series (NaN when missing)"""
+    matched = pc.extract_regex(strings, pattern=pattern)
+    number = pc.cast(pc.struct_field(matched, [0]), pa.float64())
+    return pd.Series(number.to_numpy(zero_copy_only=False), index=index, dtype='float64')
+
+def clean_price(prices):
+    """Extract numeric price from price strings"""
+    stripped = pc.replace_substring_regex(_arrow_strings(prices), pattern=_PRICE_STRIP_PATTERN, replacement='')
+    return _extract_number(stripped, _PRICE_PATTERN, prices.index)
+
+def extract_region(regions):
+    """Extract main region from full location strings"""
+    # Take the first part before a comma or the '‚' separator the site uses
+    main_region = regions.astype('string').str.split(_REGION_SEP_RE, n=1, regex=True).str[0].str.strip()
+    return main_region.fillna('Unknown')
+
+def extract_rooms(rooms):
+    """Extract number of rooms"""
+    num = _extract_number(_arrow_strings(rooms), _ROOMS_PATTERN, rooms.index)
+    num = num.where(num < 20)  # Filter outliers
+    return num.mask(rooms.astype('string').str.contains('studio', case=False, regex=False, na=False).to_numpy(dtype=bool), 0)
 
-    for i, v in enumerate(view_analysis['elan_id']):
-        ax1.text(i, v + max(view_analysis['elan_id'])*0.02, str(int(v)), ha='center', va='bottom', fontweight='bold')
+def clean_area(areas):
+    """Extract numeric area"""
+    dotted = pc.replace_substring(_arrow_strings(areas), pattern=',', replacement='.')
+    area = _extract_number(dotted, _AREA_PATTERN, areas.index)
+    return area.where((area > 10) & (area < 1000))  # Filter outliers
+
+def parse_date_posted(dates):
+    """Parse "15 noyabr 2025" style dates (an optional ", HH:MM" suffix is ignored)"""
+    dates = dates.astype('string').str.lower().str.split(',', n=1).str[0].str.strip()
+    # Numeric months let pandas use its fixed-format parser instead of locale month names
+    for name, number in MONTHS_AZ.items():
+        dates = dates.str.replace(name, number, regex=False)
+    return pd.to_datetime(dates, format='%d %m %Y', errors='coerce', cache=True)
+
+def _contains(values, pattern, regex=True):
+    """Boolean numpy mask of rows containing pattern (missing values are False)"""
+    return values.str.contains(pattern, regex=regex, na=False).to_numpy(dtype=bool)
 
-    # Right: Median price by engagement
-    bars2 = ax2.bar(range(len(view_analysis)), view_analysis['price_clean']/1000, color=colors1[:len(view_analysis)])
-    ax2.set_xticks(range(len(view_analysis)))
-    ax2.set_xticklabels(view_analysis.index, rotation=45, ha='right')
-    ax2.set_ylabel('Median Price (thousand AZN)', fontweight='bold')
-    ax2.set_title('Median Price by Engagement Level', fontweight='bold')
-    ax2.grid(axis='y', alpha=0.3)
+def get_property_type(category):
+    """Map lower-cased listing categories to property types"""
+    conditions = [
+        category.isna().to_numpy(dtype=bool),
+        _contains(category, 'yeni tikili', regex=False),
+        _contains(category, _HOUSE_RE),
+        _contains(category, 'kirayə', regex=False),
+        _contains(category, _COMMERCIAL_RE),
+    ]
+    labels = ['Other', 'New Building', 'House/Villa', 'Rental', 'Commercial']
+    return pd.Series(np.select(conditions, labels, default='Apartment'), index=category.index)
+
+def get_seller_type(advertiser):
+    """Map advertiser labels to seller types"""
+    conditions = [
+        _contains(advertiser, 'ƏMLAK sahibi', regex=False),
+        _contains(advertiser, 'Vasitəçi', regex=False),
+    ]
+    return pd.Series(np.select(conditions, ['Owner', 'Agent'], default='Unknown'), index=advertiser.index)
+
+def bucketize(values, bins, labels):
+    """Bin values like pd.cut (right-closed); values outside the bins and NaN get no bucket"""
+    codes = np.searchsorted(np.asarray(bins, dtype='float64'), values.to_numpy(dtype='float64'), side='left') - 1
+    codes[(codes < 0) | (codes >= len(labels))] = -1
+    return pd.Series(pd.Categorical.from_codes(codes, categories=labels, ordered=True), index=values.index)
+
+def top_categories(values, k):
+    """The k most frequent categories of a categorical Series as {category: count}, most frequent first"""
+    categories = values.cat.categories
+    codes = values.cat.codes.to_numpy()
+    counts = np.bincount(codes[codes >= 0], minlength=len(categories))
+    k = min(k, len(categories))
+    if k == 0:
+        return {}
+    # Select the top k without sorting every category, then order just those
+    top = np.argpartition(-counts, k - 1)[:k]
+    top = top[np.argsort(-counts[top], kind='stable')]
+    return {categories[i]: int(counts[i]) for i in top}
+
+def clean_listings(df):
+    """Add the cleaned columns to the raw listings frame"""
+    # Shared intermediates are computed once, all derived columns added in one pass
+    category_lower = df['category'].astype('string').str.lower()
+    advertiser = df['advertiser_type'].astype('string')
+    return df.assign(
+        price_clean=clean_price(df['price']),
+        region_clean=extract_region(df['region']).astype('category'),
+        rooms_clean=extract_rooms(df['room_count']),
+        area_clean=clean_area(df['area_sqm']),
+        views_numeric=pd.to_numeric(df['view_count'], errors='coerce').astype('float64'),
+        date_posted_clean=parse_date_posted(df['date_posted']),
+        property_type=get_property_type(category_lower).astype('category'),
+        seller_type=get_seller_type(advertiser).astype('category'),
+    )
+
+def cache_path():
+    """Parquet cache file for the current scraped_data.csv, keyed by its mtime, size and CACHE_VERSION"""
+    stat = os.stat(CSV_PATH)
+    key = hashlib.md5(f'{stat.st_mtime}:{stat.st_size}:{CACHE_VERSION}'.encode()).hexdigest()[:16]
+    return Path(f'scraped_clean_{key}.parquet')
+
+def load_listings():
+    """Cleaned listings, read from the Parquet cache when scraped_data.csv is unchanged"""
+    path = cache_path()
+    if path.exists():
+        print(f"Loading cleaned data from {path}")
+        return pd.read_parquet(path)
+
+    # Read data: only the columns the analysis uses, as Arrow-backed strings
+    df = pd.read_csv(
+        CSV_PATH,
+        usecols=USECOLS,
+        dtype=pd.ArrowDtype(pa.string()),
+        dtype_backend='pyarrow'
+    )
+    df = clean_listings(df)
+
+    # Drop caches of older CSVs, then write atomically so an interrupted run never leaves a broken cache
+    for stale in Path('.').glob('scraped_clean_*.parquet'):
+        stale.unlink()
+    tmp_path = path.with_suffix('.parquet.tmp')
+    df.to_parquet(tmp_path, compression='zstd')
+    os.replace(tmp_path, path)
+    return df
+
+def prepare_data():
+    """Load the cleaned listings and build the frames shared by every chart"""
+    df = load_listings()
+
+    print(f"Total listings: {len(df)}")
+    print(f"Columns: {[col for col in df.columns if col in USECOLS]}")
+
+    # Filter only listings with prices in AZN (one numpy mask, missing currency counts as not AZN)
+    price = df['price_clean'].to_numpy(dtype='float64')
+    is_azn = df['currency'].eq('azn').to_numpy(dtype=bool, na_value=False)
+    df_azn = df.loc[is_azn & np.isfinite(price) & (price > 0)]
+
+    price_stats = df_azn['price_clean'].agg(['min', 'max', 'mean', 'median'])
+
+    print(f"\nListings with valid AZN prices: {len(df_azn)}")
+    print(f"Price range: {price_stats['min']:,.0f} - {price_stats['max']:,.0f} AZN")
+
+    # Listing counts shared by the charts and the summary, counted once on the category codes
+    counts = {
+        'top_regions': top_categories(df['region_clean'], 15),
+        'property_counts': df['property_type'].value_counts(),
+        'seller_counts': df['seller_type'].value_counts(),
+    }
+
+    return {'df': df, 'df_azn': df_azn, 'price_stats': price_stats, **counts}
+
+def chart_price_by_property_type(data):
+    """Chart 1: price distribution by property type"""
+    df_azn = data['df_azn']
+    property_prices = df_azn.groupby('property_type', observed=True, sort=False)['price_clean'].agg(['mean', 'median', 'count'])
+    property_prices = property_prices[property_prices['count'] >= 10].sort_values('median', ascending=False)
+
+    x = range(len(property_prices))
+    width = 0.35
+
+    fig, ax = plt.subplots(figsize=(12, 6))
+    bars1 = ax.bar([i - width/2 for i in x], property_prices['median']/1000, width, label='Median Price', color='#2E86AB', rasterized=True)
+    bars2 = ax.bar([i + width/2 for i in x], property_prices['mean']/1000, width, label='Average Price', color='#A23B72', rasterized=True)
+
+    ax.set_ylabel('Price (thousand AZN)', fontweight='bold')
+    ax.set_title('Property Prices by Type - Market Overview', fontweight='bold', fontsize=14)
+    ax.set_xticks(x)
+    ax.set_xticklabels(property_prices.index, rotation=45, ha='right')
+    ax.legend()
+    ax.grid(axis='y', alpha=0.3)
 
-    for i, v in enumerate(view_analysis['price_clean']):
-        ax2.text(i, v/1000 + max(view_analysis['price_clean'])/1000*0.02, f'{v/1000:.0f}K', ha='center', va='bottom', fontweight='bold')
+    # Add value labels
+    for bars in [bars1, bars2]:
+        for bar in bars:
+            height = bar.get_height()
+            ax.text(bar.get_x() + bar.get_width()/2., height,
+                    f'{height:.0f}K',
+                    ha='center', va='bottom', fontsize=9)
 
     plt.tight_layout()
-    plt.savefig('charts/04_engagement_analysis.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    print("✓ Generated: Engagement Analysis")
+    plt.savefig('charts/01_price_by_property_type.png', **SAVEFIG_KWARGS)
+    plt.close(fig)
+    return "✓ Generated: Price by Property Type"
+
+def chart_supply_by_region(data):
+    """Chart 2: market supply by region (top 15)"""
+    region_counts = data['top_regions']
+
+    fig, ax = plt.subplots(figsize=(14, 6))
+    bars = ax.barh(range(len(region_counts)), list(region_counts.values()), color='#06A77D', rasterized=True)
+    ax.set_yticks(range(len(region_counts)))
+    ax.set_yticklabels(list(region_counts))
+    ax.set_xlabel('Number of Listings', fontweight='bold')
+    ax.set_title('Market Supply by Region - Where Properties Are Listed', fontweight='bold', fontsize=14)
+    ax.grid(axis='x', alpha=0.3)
+    ax.invert_yaxis()
+
+    # Add value labels
+    for i, v in enumerate(region_counts.values()):
+        ax.text(v + 5, i, str(v), va='center', fontweight='bold')
 
-# === CHART 5: Market Activity - Listings Over Time ===
-df['date_posted_clean'] = pd.to_datetime(df['date_posted'], format='%d %B %Y', errors='coerce')
-df_dated = df[df['date_posted_clean'].notna()].copy()
+    plt.tight_layout()
+    plt.savefig('charts/02_supply_by_region.png', **SAVEFIG_KWARGS)
+    plt.close(fig)
+    return "✓ Generated: Supply by Region"
+
+def chart_price_by_rooms(data):
+    """Chart 3: price distribution by number of rooms"""
+    df_azn = data['df_azn']
+    df_rooms = df_azn[df_azn['rooms_clean'].notna() & (df_azn['rooms_clean'] <= 6)]
+    if len(df_rooms) > 50:
+        room_prices = df_rooms.groupby('rooms_clean')['price_clean'].agg(['median', 'count'])
+        room_prices = room_prices[room_prices['count'] >= 10]
+
+        fig, ax1 = plt.subplots(figsize=(12, 6))
+
+        color = '#2E86AB'
+        ax1.set_xlabel('Number of Rooms', fontweight='bold')
+        ax1.set_ylabel('Median Price (AZN)', color=color, fontweight='bold')
+        bars = ax1.bar(room_prices.index, room_prices['median'], color=color, alpha=0.7, label='Median Price', rasterized=True)
+        ax1.tick_params(axis='y', labelcolor=color)
+        ax1.grid(axis='y', alpha=0.3)
+
+        # Add second y-axis for count
+        ax2 = ax1.twinx()
+        color = '#F18F01'
+        ax2.set_ylabel('Number of Listings', color=color, fontweight='bold')
+        line = ax2.plot(room_prices.index, room_prices['count'], color=color, marker='o', linewidth=2, markersize=8, label='Listing Count', rasterized=True)
+        ax2.tick_params(axis='y', labelcolor=color)
+
+        # Add value labels on bars
+        for i, v in enumerate(room_prices['median']):
+            ax1.text(room_prices.index[i], v + 5000, f'{v/1000:.0f}K', ha='center', va='bottom', fontweight='bold')
+
+        plt.title('Property Prices by Number of Rooms', fontweight='bold', fontsize=14)
+        fig.tight_layout()
+        plt.savefig('charts/03_price_by_rooms.png', **SAVEFIG_KWARGS)
+        plt.close(fig)
+        return "✓ Generated: Price by Rooms"
+
+def chart_engagement(data):
+    """Chart 4: listing engagement analysis - view count insights"""
+    df_azn = data['df_azn']
+    if df_azn['view_count'].notna().sum() > 100:
+        views_numeric = df_azn['views_numeric']
+        has_views = views_numeric.gt(0)
+
+        # Create view categories
+        view_bins = [0, 100, 500, 1000, 2000, 10000]
+        view_labels = ['Low (<100)', 'Medium (100-500)', 'High (500-1K)', 'Very High (1K-2K)', 'Viral (>2K)']
+        view_category = bucketize(views_numeric[has_views], view_bins, view_labels)
+
+        # Analyze price vs engagement (only the two aggregated columns are selected)
+        view_analysis = df_azn.loc[has_views, ['price_clean', 'elan_id']].groupby(view_category, observed=True).agg(
+            median_price=('price_clean', 'median'),
+            listings=('elan_id', 'count'),
+        ).dropna()
+
+        # Label values and offsets, computed once for both panels
+        counts = view_analysis['listings'].to_numpy()
+        medians_k = (view_analysis['median_price'] / 1000).to_numpy()
+        count_offset = counts.max() * 0.02
+        median_offset = medians_k.max() * 0.02
+
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+
+        # Left: Listing count by engagement
+        colors1 = ['#E63946', '#F18F01', '#06A77D', '#2E86AB', '#7209B7']
+        bars1 = ax1.bar(range(len(view_analysis)), counts, color=colors1[:len(view_analysis)], rasterized=True)
+        ax1.set_xticks(range(len(view_analysis)))
+        ax1.set_xticklabels(view_analysis.index, rotation=45, ha='right')
+        ax1.set_ylabel('Number of Listings', fontweight='bold')
+        ax1.set_title('Listing Distribution by Engagement Level', fontweight='bold')
+        ax1.grid(axis='y', alpha=0.3)
+
+        for i, v in enumerate(counts):
+            ax1.text(i, v + count_offset, str(int(v)), ha='center', va='bottom', fontweight='bold')
+
+        # Right: Median price by engagement
+        bars2 = ax2.bar(range(len(view_analysis)), medians_k, color=colors1[:len(view_analysis)], rasterized=True)
+        ax2.set_xticks(range(len(view_analysis)))
+        ax2.set_xticklabels(view_analysis.index, rotation=45, ha='right')
+        ax2.set_ylabel('Median Price (thousand AZN)', fontweight='bold')
+        ax2.set_title('Median Price by Engagement Level', fontweight='bold')
+        ax2.grid(axis='y', alpha=0.3)
+
+        for i, v in enumerate(medians_k):
+            ax2.text(i, v + median_offset, f'{v:.0f}K', ha='center', va='bottom', fontweight='bold')
+
+        plt.tight_layout()
+        plt.savefig('charts/04_engagement_analysis.png', **SAVEFIG_KWARGS)
+        plt.close(fig)
+        return "✓ Generated: Engagement Analysis"
+
+def chart_listings_over_time(data):
+    """Chart 5: market activity - listings over time"""
+    df = data['df']
+    date_posted_clean = df['date_posted_clean']
+
+    if date_posted_clean.notna().sum() > 50:
+        month = date_posted_clean.dt.to_period('M')
+        # groupby drops undated rows and sorts the PeriodIndex chronologically;
+        # periods become strings only for the tick labels
+        monthly_counts = month.groupby(month, sort=True).size()
+
+        plt.figure(figsize=(14, 6))
+        plt.plot(range(len(monthly_counts)), monthly_counts.values, marker='o', linewidth=2, markersize=8, color='#06A77D', rasterized=True)
+        plt.xticks(range(len(monthly_counts)), [str(p) for p in monthly_counts.index], rotation=45, ha='right')
+        plt.ylabel('Number of New Listings', fontweight='bold')
+        plt.xlabel('Month', fontweight='bold')
+        plt.title('Market Activity Trend - New Listings Over Time', fontweight='bold', fontsize=14)
+        plt.grid(True, alpha=0.3)
+
+        # Add value labels on points
+        label_offset = monthly_counts.max() * 0.02
+        for i, v in enumerate(monthly_counts.values):
+            plt.text(i, v + label_offset, str(v), ha='center', va='bottom', fontweight='bold')
+
+        plt.tight_layout()
+        plt.savefig('charts/05_listings_over_time.png', **SAVEFIG_KWARGS)
+        plt.close()
+        return "✓ Generated: Listings Over Time"
+
+def chart_size_distribution(data):
+    """Chart 6: property size distribution"""
+    df_azn = data['df_azn']
+    if df_azn['area_clean'].notna().sum() > 100:
+        # Create size categories (missing areas stay NaN and are not counted)
+        bins = [0, 50, 75, 100, 150, 200, 500]
+        labels = ['<50m²', '50-75m²', '75-100m²', '100-150m²', '150-200m²', '>200m²']
+        size_category = bucketize(df_azn['area_clean'], bins, labels)
+
+        size_dist = size_category.value_counts().sort_index()
+
+        plt.figure(figsize=(12, 6))
+        bars = plt.bar(range(len(size_dist)), size_dist.values, color='#7209B7', rasterized=True)
+        plt.xticks(range(len(size_dist)), size_dist.index, rotation=45, ha='right')
+        plt.ylabel('Number of Properties', fontweight='bold')
+        plt.xlabel('Property Size', fontweight='bold')
+        plt.title('Property Size Distribution - Market Composition', fontweight='bold', fontsize=14)
+        plt.grid(axis='y', alpha=0.3)
+
+        # Add value labels
+        label_offset = size_dist.max() * 0.02
+        for i, v in enumerate(size_dist.values):
+            plt.text(i, v + label_offset, str(v), ha='center', va='bottom', fontweight='bold')
+
+        # Add percentage labels
+        total = size_dist.sum()
+        for i, v in enumerate(size_dist.values):
+            pct = (v/total)*100
+            plt.text(i, v/2, f'{pct:.1f}%', ha='center', va='center', color='white', fontweight='bold', fontsize=11)
+
+        plt.tight_layout()
+        plt.savefig('charts/06_property_size_distribution.png', **SAVEFIG_KWARGS)
+        plt.close()
+        return "✓ Generated: Property Size Distribution"
+
+def chart_seller_types(data):
+    """Chart 7: seller type analysis"""
+    df_azn, seller_counts = data['df_azn'], data['seller_counts']
+    seller_prices = df_azn.groupby('seller_type', observed=True)['price_clean'].median()
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
 
-if len(df_dated) > 50:
-    df_dated['month'] = df_dated['date_posted_clean'].dt.to_period('M')
-    monthly_counts = df_dated.groupby('month').size().sort_index()
+    # Count by seller type
+    bars1 = ax1.bar(range(len(seller_counts)), seller_counts.values, color=['#2E86AB', '#F18F01', '#CCCCCC'], rasterized=True)
+    ax1.set_xticks(range(len(seller_counts)))
+    ax1.set_xticklabels(seller_counts.index)
+    ax1.set_ylabel('Number of Listings', fontweight='bold')
+    ax1.set_title('Listings by Seller Type', fontweight='bold')
+    ax1.grid(axis='y', alpha=0.3)
 
-    # Convert period to string for plotting
-    monthly_counts.index = monthly_counts.index.astype(str)
+    label_offset = seller_counts.max() * 0.02
+    for i, v in enumerate(seller_counts.values):
+        ax1.text(i, v + label_offset, str(v), ha='center', va='bottom', fontweight='bold')
 
-    plt.figure(figsize=(14, 6))
-    plt.plot(range(len(monthly_counts)), monthly_counts.values, marker='o', linewidth=2, markersize=8, color='#06A77D')
-    plt.xticks(range(len(monthly_counts)), monthly_counts.index, rotation=45, ha='right')
-    plt.ylabel('Number of New Listings', fontweight='bold')
-    plt.xlabel('Month', fontweight='bold')
-    plt.title('Market Activity Trend - New Listings Over Time', fontweight='bold', fontsize=14)
-    plt.grid(True, alpha=0.3)
+    # Median price by seller type
+    seller_prices_filtered = seller_prices[seller_prices.index.isin(['Owner', 'Agent'])]
+    bars2 = ax2.bar(range(len(seller_prices_filtered)), seller_prices_filtered.values/1000, color=['#2E86AB', '#F18F01'], rasterized=True)
+    ax2.set_xticks(range(len(seller_prices_filtered)))
+    ax2.set_xticklabels(seller_prices_filtered.index)
+    ax2.set_ylabel('Median Price (thousand AZN)', fontweight='bold')
+    ax2.set_title('Median Price by Seller Type', fontweight='bold')
+    ax2.grid(axis='y', alpha=0.3)
 
-    # Add value labels on points
-    for i, v in enumerate(monthly_counts.values):
-        plt.text(i, v + max(monthly_counts.values)*0.02, str(v), ha='center', va='bottom', fontweight='bold')
+    label_offset = seller_prices_filtered.max() / 1000 * 0.02
+    for i, v in enumerate(seller_prices_filtered.values):
+        ax2.text(i, v/1000 + label_offset, f'{v/1000:.0f}K', ha='center', va='bottom', fontweight='bold')
 
     plt.tight_layout()
-    plt.savefig('charts/05_listings_over_time.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    print("✓ Generated: Listings Over Time")
+    plt.savefig('charts/07_seller_type_analysis.png', **SAVEFIG_KWARGS)
+    plt.close(fig)
+    return "✓ Generated: Seller Type Analysis"
 
-# === CHART 6: Property Size Distribution ===
-df_size = df_azn[df_azn['area_clean'].notna()]
-if len(df_size) > 100:
-    # Create size categories
-    bins = [0, 50, 75, 100, 150, 200, 500]
-    labels = ['<50m²', '50-75m²', '75-100m²', '100-150m²', '150-200m²', '>200m²']
-    df_size['size_category'] = pd.cut(df_size['area_clean'], bins=bins, labels=labels)
+def chart_price_ranges(data):
+    """Chart 8: price range distribution"""
+    df_azn = data['df_azn']
+    price_bins = [0, 50000, 100000, 150000, 200000, 300000, 500000, 1000000, 5000000]
+    price_labels = ['<50K', '50-100K', '100-150K', '150-200K', '200-300K', '300-500K', '500K-1M', '>1M']
+    price_range = bucketize(df_azn['price_clean'], price_bins, price_labels)
 
-    size_dist = df_size['size_category'].value_counts().sort_index()
+    price_dist = price_range.value_counts().sort_index()
 
     plt.figure(figsize=(12, 6))
-    bars = plt.bar(range(len(size_dist)), size_dist.values, color='#7209B7')
-    plt.xticks(range(len(size_dist)), size_dist.index, rotation=45, ha='right')
+    bars = plt.bar(range(len(price_dist)), price_dist.values, color='#06A77D', rasterized=True)
+    plt.xticks(range(len(price_dist)), price_dist.index, rotation=45, ha='right')
     plt.ylabel('Number of Properties', fontweight='bold')
-    plt.xlabel('Property Size', fontweight='bold')
-    plt.title('Property Size Distribution - Market Composition', fontweight='bold', fontsize=14)
+    plt.xlabel('Price Range (AZN)', fontweight='bold')
+    plt.title('Property Price Range Distribution', fontweight='bold', fontsize=14)
     plt.grid(axis='y', alpha=0.3)
 
     # Add value labels
-    for i, v in enumerate(size_dist.values):
-        plt.text(i, v + max(size_dist.values)*0.02, str(v), ha='center', va='bottom', fontweight='bold')
+    label_offset = price_dist.max() * 0.02
+    for i, v in enumerate(price_dist.values):
+        plt.text(i, v + label_offset, str(v), ha='center', va='bottom', fontweight='bold')
 
     # Add percentage labels
-    total = size_dist.sum()
-    for i, v in enumerate(size_dist.values):
+    total = price_dist.sum()
+    for i, v in enumerate(price_dist.values):
         pct = (v/total)*100
-        plt.text(i, v/2, f'{pct:.1f}%', ha='center', va='center', color='white', fontweight='bold', fontsize=11)
+        if pct > 2:  # Only show if >2%
+            plt.text(i, v/2, f'{pct:.1f}%', ha='center', va='center', color='white', fontweight='bold', fontsize=10)
 
     plt.tight_layout()
-    plt.savefig('charts/06_property_size_distribution.png', dpi=300, bbox_inches='tight')
+    plt.savefig('charts/08_price_range_distribution.png', **SAVEFIG_KWARGS)
     plt.close()
-    print("✓ Generated: Property Size Distribution")
-
-# === CHART 7: Seller Type Analysis ===
-df['seller_type'] = df['advertiser_type'].apply(lambda x:
-    'Owner' if pd.notna(x) and 'ƏMLAK sahibi' in str(x)
-    else 'Agent' if pd.notna(x) and 'Vasitəçi' in str(x)
-    else 'Unknown'
-)
-
-seller_counts = df['seller_type'].value_counts()
-seller_prices = df_azn.groupby(df['seller_type'])['price_clean'].median()
-
-fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
-
-# Count by seller type
-bars1 = ax1.bar(range(len(seller_counts)), seller_counts.values, color=['#2E86AB', '#F18F01', '#CCCCCC'])
-ax1.set_xticks(range(len(seller_counts)))
-ax1.set_xticklabels(seller_counts.index)
-ax1.set_ylabel('Number of Listings', fontweight='bold')
-ax1.set_title('Listings by Seller Type', fontweight='bold')
-ax1.grid(axis='y', alpha=0.3)
-
-for i, v in enumerate(seller_counts.values):
-    ax1.text(i, v + max(seller_counts.values)*0.02, str(v), ha='center', va='bottom', fontweight='bold')
-
-# Median price by seller type
-seller_prices_filtered = seller_prices[seller_prices.index.isin(['Owner', 'Agent'])]
-bars2 = ax2.bar(range(len(seller_prices_filtered)), seller_prices_filtered.values/1000, color=['#2E86AB', '#F18F01'])
-ax2.set_xticks(range(len(seller_prices_filtered)))
-ax2.set_xticklabels(seller_prices_filtered.index)
-ax2.set_ylabel('Median Price (thousand AZN)', fontweight='bold')
-ax2.set_title('Median Price by Seller Type', fontweight='bold')
-ax2.grid(axis='y', alpha=0.3)
-
-for i, v in enumerate(seller_prices_filtered.values):
-    ax2.text(i, v/1000 + max(seller_prices_filtered.values)/1000*0.02, f'{v/1000:.0f}K', ha='center', va='bottom', fontweight='bold')
-
-plt.tight_layout()
-plt.savefig('charts/07_seller_type_analysis.png', dpi=300, bbox_inches='tight')
-plt.close()
-print("✓ Generated: Seller Type Analysis")
-
-# === CHART 8: Price Range Distribution ===
-price_bins = [0, 50000, 100000, 150000, 200000, 300000, 500000, 1000000, 5000000]
-price_labels = ['<50K', '50-100K', '100-150K', '150-200K', '200-300K', '300-500K', '500K-1M', '>1M']
-df_azn['price_range'] = pd.cut(df_azn['price_clean'], bins=price_bins, labels=price_labels)
-
-price_dist = df_azn['price_range'].value_counts().sort_index()
-
-plt.figure(figsize=(12, 6))
-bars = plt.bar(range(len(price_dist)), price_dist.values, color='#06A77D')
-plt.xticks(range(len(price_dist)), price_dist.index, rotation=45, ha='right')
-plt.ylabel('Number of Properties', fontweight='bold')
-plt.xlabel('Price Range (AZN)', fontweight='bold')
-plt.title('Property Price Range Distribution', fontweight='bold', fontsize=14)
-plt.grid(axis='y', alpha=0.3)
-
-# Add value labels
-for i, v in enumerate(price_dist.values):
-    plt.text(i, v + max(price_dist.values)*0.02, str(v), ha='center', va='bottom', fontweight='bold')
-
-# Add percentage labels
-total = price_dist.sum()
-for i, v in enumerate(price_dist.values):
-    pct = (v/total)*100
-    if pct > 2:  # Only show if >2%
-        plt.text(i, v/2, f'{pct:.1f}%', ha='center', va='center', color='white', fontweight='bold', fontsize=10)
-
-plt.tight_layout()
-plt.savefig('charts/08_price_range_distribution.png', dpi=300, bbox_inches='tight')
-plt.close()
-print("✓ Generated: Price Range Distribution")
-
-# === Generate Summary Statistics ===
-summary = {
-    'total_listings': len(df),
-    'valid_prices': len(df_azn),
-    'median_price': int(df_azn['price_clean'].median()),
-    'average_price': int(df_azn['price_clean'].mean()),
-    'price_min': int(df_azn['price_clean'].min()),
-    'price_max': int(df_azn['price_clean'].max()),
-    'top_regions': df['region_clean'].value_counts().head(5).to_dict(),
-    'property_types': df['property_type'].value_counts().to_dict(),
-    'seller_distribution': df['seller_type'].value_counts().to_dict()
-}
-
-with open('charts/summary_stats.json', 'w', encoding='utf-8') as f:
-    json.dump(summary, f, indent=2, ensure_ascii=False)
-
-print("\n" + "="*50)
-print("ANALYSIS COMPLETE")
-print("="*50)
-print(f"Total Listings Analyzed: {summary['total_listings']:,}")
-print(f"Median Price: {summary['median_price']:,} AZN")
-print(f"Average Price: {summary['average_price']:,} AZN")
-print(f"Price Range: {summary['price_min']:,} - {summary['price_max']:,} AZN")
-print(f"\nAll charts saved to charts/ directory")
-print("Summary statistics saved to charts/summary_stats.json")
+    return "✓ Generated: Price Range Distribution"
+
+# All charts are independent, so they are rendered in parallel worker processes
+CHARTS = [
+    chart_price_by_property_type,
+    chart_supply_by_region,
+    chart_price_by_rooms,
+    chart_engagement,
+    chart_listings_over_time,
+    chart_size_distribution,
+    chart_seller_types,
+    chart_price_ranges,
+]
+
+_worker_data = None
+
+def _init_worker(data):
+    """Receive the cleaned frames once per worker process"""
+    global _worker_data
+    _worker_data = data
+
+def _render_chart(index):
+    return CHARTS[index](_worker_data)
+
+def write_summary(data):
+    """Write charts/summary_stats.json and print the headline numbers"""
+    df, df_azn, price_stats = data['df'], data['df_azn'], data['price_stats']
+    summary = {
+        'total_listings': len(df),
+        'valid_prices': len(df_azn),
+        'median_price': int(price_stats['median']),
+        'average_price': int(price_stats['mean']),
+        'price_min': int(price_stats['min']),
+        'price_max': int(price_stats['max']),
+        'top_regions': dict(list(data['top_regions'].items())[:5]),
+        'property_types': data['property_counts'].to_dict(),
+        'seller_distribution': data['seller_counts'].to_dict()
+    }
+
+    with open('charts/summary_stats.json', 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+
+    print("\n" + "="*50)
+    print("ANALYSIS COMPLETE")
+    print("="*50)
+    print(f"Total Listings Analyzed: {summary['total_listings']:,}")
+    print(f"Median Price: {summary['median_price']:,} AZN")
+    print(f"Average Price: {summary['average_price']:,} AZN")
+    print(f"Price Range: {summary['price_min']:,} - {summary['price_max']:,} AZN")
+    print(f"\nAll charts saved to charts/ directory")
+    print("Summary statistics saved to charts/summary_stats.json")
+
+def main():
+    # Create charts directory
+    Path('charts').mkdir(exist_ok=True)
+
+    data = prepare_data()
+
+    workers = min(len(CHARTS), os.cpu_count() or 1)
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(data,)) as pool:
+        for message in pool.imap(_render_chart, range(len(CHARTS))):
+            if message:
+                print(message)
+
+    # === Generate Summary Statistics ===
+    write_summary(data)
+
+if __name__ == '__main__':
+    main()
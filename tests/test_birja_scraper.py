@@ -0,0 +1,169 @@
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+from selectolax.lexbor import LexborHTMLParser
+
+import birja_scraper
+from birja_scraper import BirjaScraper
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    # Progress and output files are relative paths; keep them out of the repo
+    monkeypatch.chdir(tmp_path)
+    return BirjaScraper()
+
+
+@pytest.fixture
+def listing_page():
+    return LexborHTMLParser((FIXTURES / 'listing_page.html').read_bytes())
+
+
+@pytest.mark.parametrize('name', [name for name in dir(birja_scraper) if name.startswith('_SEL_')])
+def test_selector_parses(name):
+    # extract_* log and swallow errors, so an unsupported selector would
+    # otherwise just produce empty rows
+    LexborHTMLParser('<html><body></body></html>').css(getattr(birja_scraper, name))
+
+
+def test_page_listing_ids(listing_page):
+    spans = listing_page.css(birja_scraper._SEL_ELAN)
+    assert [span.text().strip() for span in spans] == ['Elan № 249865', 'Elan № 250112']
+
+
+def test_extract_listing_info(scraper, listing_page):
+    cards = listing_page.css('div.block_one_synopsis_advert')
+    assert len(cards) == 2
+
+    first = scraper.extract_listing_info(cards[0])
+    assert first == {
+        'elan_id': '249865',
+        'title': 'Satılır Həyət evi Mərdəkanda 2 mərtəbəli 6otaq 6 sotda',
+        'url': 'https://birja-in.az/Satilir-Heyet-evi-Merdekanda-2-mertebeli-6otaq-6-sotda-adv249865.html',
+        'price': '390000',
+        'currency': 'azn',
+        'location': 'Bakı, Mərdəkan',
+        'category': 'Satılan Həyət evləri, Villa',
+        'short_description': 'Mərdəkanda 6 sot torpaq sahəsində 2 mərtəbəli həyət evi satılır.',
+        'date_posted': '15 noyabr 2025',
+    }
+
+    # Titles without an itemprop span fall back to the link text; spaces in hrefs become hyphens
+    second = scraper.extract_listing_info(cards[1])
+    assert second['elan_id'] == '250112'
+    assert second['title'] == 'Yasamalda 3 otaqlı mənzil'
+    assert second['url'] == 'https://birja-in.az/Yasamalda-3-otaqli-menzil-adv250112.html'
+    assert second['category'] == 'Satılan Yeni tikili'
+    assert 'short_description' not in second
+
+
+def test_extract_listing_info_skips_scraped(scraper, listing_page):
+    scraper.scraped_ids.add('249865')
+    card = listing_page.css_first('div.block_one_synopsis_advert')
+    assert scraper.extract_listing_info(card) is None
+
+
+def test_extract_detail_info(scraper):
+    html = (FIXTURES / 'detail_page.html').read_bytes()
+    data = scraper.extract_detail_info(html, {'elan_id': '249865'})
+
+    assert data['description'] == 'Mərdəkanda 6 sot torpaq sahəsində 2 mərtəbəli həyət evi satılır. Kupça var.'
+    assert data['region'] == 'Bakı‚ Xəzər r‚ Mərdəkan'
+    assert data['elan_type'] == 'Satılır'
+    assert data['property_type'] == 'Həyət evi'
+    assert data['room_count'] == '5 otaq və çox otaqlı'
+    assert data['house_area_sqm'] == '220'
+    assert data['land_area_sot'] == '6'
+    # Empty values are dropped from the property table, so the column stays blank
+    assert not data.get('repair_status')
+    assert data['advertiser_type'] == 'ƏMLAK sahibi'
+    assert data['contact_name'] == 'Rəşad'
+    assert data['phone'] == '(050) 555-12-34'
+    assert data['view_count'] == '1342'
+    assert data['images'] == 'https://birja-in.az/upload/249865/1.jpg|https://birja-in.az/upload/249865/2.jpg'
+    assert json.loads(data['all_properties']) == {
+        'Şəhər/ərazi': 'Bakı‚ Xəzər r‚ Mərdəkan',
+        'Elan növü': 'Satılır',
+        'Əmlak növü': 'Həyət evi',
+        'Otaq sayı': '5 otaq və çox otaqlı',
+        'Evin-sahəsi (m²)': '220',
+        'Ümumi-sahə (sot)': '6',
+        'Telefon:': '(050) 555-12-34',
+    }
+    assert data['scraped_at']
+
+
+def test_record_failed_deduplicates(scraper):
+    scraper.record_failed('https://birja-in.az/elanlar/ev-alqi-satqisi/num3.html')
+    scraper.record_failed('https://birja-in.az/elanlar/ev-alqi-satqisi/num3.html')
+    scraper.record_failed('https://birja-in.az/Satilir-Heyet-evi-adv249865.html')
+    assert [item['url'] for item in scraper.failed_urls] == [
+        'https://birja-in.az/elanlar/ev-alqi-satqisi/num3.html',
+        'https://birja-in.az/Satilir-Heyet-evi-adv249865.html',
+    ]
+
+
+class FailingWriter:
+    def writerows(self, rows):
+        raise OSError('disk full')
+
+
+async def queue_rows(scraper, count, break_writer=False, break_open=None):
+    await scraper.create_session()
+    if break_writer:
+        scraper._csv_writer = FailingWriter()
+    if break_open:
+        # The CSV is already open, so only the backup goes through this open
+        break_open.setattr(birja_scraper, 'open', failing_open, raising=False)
+    # More rows than the queue holds, so a dead writer would block put()
+    for i in range(count):
+        await scraper.write_to_csv({'elan_id': str(i), 'title': f'Listing {i}'})
+    await scraper.close_session()
+    scraper.save_progress()
+
+
+def run_writer(scraper, count, **kwargs):
+    # A deadlocked writer fails the test instead of hanging it
+    asyncio.run(asyncio.wait_for(queue_rows(scraper, count, **kwargs), timeout=10))
+
+
+def failing_open(*args, **kwargs):
+    raise OSError('read-only file system')
+
+
+def logged_ids(scraper):
+    if not scraper.progress_file.exists():
+        return []
+    return scraper.progress_file.read_text(encoding='utf-8').split()
+
+
+def backup_rows():
+    return [json.loads(line) for path in Path('.').glob('backup_*.json') for line in path.read_bytes().splitlines()]
+
+
+def test_writer_logs_ids_after_flush(scraper):
+    run_writer(scraper, 1500)
+
+    assert logged_ids(scraper) == [str(i) for i in range(1500)]
+    with open(scraper.output_file, encoding='utf-8') as f:
+        assert sum(1 for _ in f) == 1501
+    assert not backup_rows()
+
+
+def test_failed_batch_goes_to_backup_unlogged(scraper):
+    run_writer(scraper, 1500, break_writer=True)
+
+    # Every row was drained into the backup, none is marked as scraped
+    assert sorted(int(row['elan_id']) for row in backup_rows()) == list(range(1500))
+    assert logged_ids(scraper) == []
+
+
+def test_writer_survives_backup_failure(scraper, monkeypatch):
+    run_writer(scraper, 1500, break_writer=True, break_open=monkeypatch)
+
+    assert not backup_rows()
+    assert logged_ids(scraper) == []
@@ -0,0 +1,104 @@
+import math
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+pa = pytest.importorskip('pyarrow')
+pytest.importorskip('matplotlib')
+pytest.importorskip('seaborn')
+
+import generate_charts
+
+
+def arrow_strings(values):
+    """A Series typed like the columns read_csv produces"""
+    return pd.Series(values, dtype=pd.ArrowDtype(pa.string()))
+
+
+def assert_floats(series, expected):
+    assert series.dtype == 'float64'
+    assert len(series) == len(expected)
+    for got, want in zip(series.tolist(), expected):
+        if want is None:
+            assert math.isnan(got)
+        else:
+            assert got == want
+
+
+def test_clean_price_with_nulls():
+    prices = arrow_strings(['390 000', None, '1,250,000', 'Razılaşma', ''])
+    assert_floats(generate_charts.clean_price(prices), [390000.0, None, 1250000.0, None, None])
+
+
+def test_extract_rooms_with_nulls():
+    rooms = arrow_strings(['3 otaqlı', None, 'Studio', '25', '5 otaq və çox otaqlı'])
+    assert_floats(generate_charts.extract_rooms(rooms), [3.0, None, 0.0, None, 5.0])
+
+
+def test_clean_area_with_nulls():
+    areas = arrow_strings(['85,5', None, '5', '2000', '120 m²', '12.'])
+    assert_floats(generate_charts.clean_area(areas), [85.5, None, None, None, 120.0, 12.0])
+
+
+def test_clean_listings_with_nulls():
+    rows = {column: [None, None] for column in generate_charts.USECOLS}
+    rows.update(
+        elan_id=['249865', '250112'],
+        price=['390000', None],
+        currency=['azn', None],
+        region=['Bakı‚ Xəzər r‚ Mərdəkan', None],
+        room_count=['5 otaq və çox otaqlı', None],
+        area_sqm=['220', None],
+        category=['Satılan Həyət evləri, Villa', None],
+        view_count=['1342', None],
+        date_posted=['30 dekabr 2025, 14:41', None],
+        advertiser_type=['ƏMLAK sahibi', None],
+    )
+    df = generate_charts.clean_listings(pd.DataFrame(rows, dtype=pd.ArrowDtype(pa.string())))
+
+    first, second = df.iloc[0], df.iloc[1]
+    assert first['price_clean'] == 390000.0
+    assert first['region_clean'] == 'Bakı'
+    assert first['rooms_clean'] == 5.0
+    assert first['area_clean'] == 220.0
+    assert first['views_numeric'] == 1342.0
+    assert first['date_posted_clean'] == pd.Timestamp('2025-12-30')
+    assert first['property_type'] == 'House/Villa'
+    assert first['seller_type'] == 'Owner'
+
+    for column in ['price_clean', 'rooms_clean', 'area_clean', 'views_numeric']:
+        assert math.isnan(second[column])
+    assert pd.isna(second['date_posted_clean'])
+    assert second['region_clean'] == 'Unknown'
+    assert second['property_type'] == 'Other'
+    assert second['seller_type'] == 'Unknown'
+
+
+@pytest.mark.parametrize('bins, labels', [
+    ([0, 100, 500, 1000, 2000, 10000], ['Low (<100)', 'Medium (100-500)', 'High (500-1K)', 'Very High (1K-2K)', 'Viral (>2K)']),
+    ([0, 50, 75, 100, 150, 200, 500], ['<50m²', '50-75m²', '75-100m²', '100-150m²', '150-200m²', '>200m²']),
+    ([0, 50000, 100000, 150000, 200000, 300000, 500000, 1000000, 5000000],
+     ['<50K', '50-100K', '100-150K', '150-200K', '200-300K', '300-500K', '500K-1M', '>1M']),
+])
+def test_bucketize_matches_pd_cut(bins, labels):
+    # Zero, every edge, just either side of each edge, beyond the last edge, negatives and NaN
+    values = [-1.0, 0.0, float('nan')]
+    for edge in bins:
+        values += [edge - 0.5, float(edge), edge + 0.5]
+    values += [bins[-1] * 10.0, float('inf')]
+    series = pd.Series(values, dtype='float64')
+
+    pd.testing.assert_series_equal(
+        generate_charts.bucketize(series, bins, labels),
+        pd.cut(series, bins, labels=labels),
+    )
+
+
+@pytest.mark.parametrize('k', [0, 1, 3, 5, 10])
+def test_top_categories_matches_value_counts(k):
+    # Distinct counts so the order is unambiguous; one unused category and missing values
+    values = ['Yasamal'] * 7 + ['Nəsimi'] * 5 + ['Bakı'] * 9 + ['Xətai'] * 2 + ['Sumqayıt'] + [None] * 4
+    regions = pd.Series(values, dtype=pd.CategoricalDtype(['Bakı', 'Nəsimi', 'Sumqayıt', 'Xətai', 'Yasamal', 'Quba']))
+    expected = {region: count for region, count in regions.value_counts().head(k).items()}
+
+    assert generate_charts.top_categories(regions, k) == expected